@@ -0,0 +1,335 @@
+
+
+import argparse
+import csv
+import math
+import sys
+from functools import lru_cache
+
+
+# 1/sqrt(2*pi), the normalizing constant of the standard normal probability density function
+_INV_SQRT_2PI = 0.3989422804014327
+
+
+def ndtr(x):
+    '''
+    Standard normal cumulative distribution function, scipy.special.ndtr.
+    Importing SciPy (and NumPy with it) takes most of the startup time, so it is only imported on the first call,
+    which replaces this function with scipy.special.ndtr. --help, invalid input and the prompts don't wait for it.
+    '''
+    global ndtr
+    from scipy.special import ndtr
+    return ndtr(x)
+
+
+def _core(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the values shared by the option price and all of the greeks.
+    Every square root, exponential, logarithm and cumulative distribution function is evaluated only once.
+    '''
+    sqrt_t = math.sqrt(t)
+    sig_sqrt_t = sigma*sqrt_t
+    inv_sig_sqrt_t = 1.0/sig_sqrt_t
+    K_disc = K*math.exp(-r*t)
+    rK_disc = r*K_disc
+    d1 = (math.log(S/K) + (r + 0.5*sigma*sigma)*t)*inv_sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    # Only the two N values used by the formulas of the option type are evaluated, the other two are derived
+    # with N(-x) = 1 - N(x). Deriving the put values that way would round the small N(-x) of out-of-the-money puts to 0
+    if is_call:
+        N_d1 = ndtr(d1)
+        N_d2 = ndtr(d2)
+        N_neg_d1 = 1.0 - N_d1
+        N_neg_d2 = 1.0 - N_d2
+    else:
+        N_neg_d1 = ndtr(-d1)
+        N_neg_d2 = ndtr(-d2)
+        N_d1 = 1.0 - N_neg_d1
+        N_d2 = 1.0 - N_neg_d2
+    pdf_d1 = _INV_SQRT_2PI*math.exp(-0.5*d1*d1)
+    return d1, d2, sqrt_t, inv_sig_sqrt_t, K_disc, rK_disc, N_d1, N_d2, N_neg_d1, N_neg_d2, pdf_d1
+
+
+def core_all(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the call price, put price, delta, gamma, theta, vega and rho from a single evaluation of _core.
+    The price of the given option type is calculated directly and the other one from it using put-call parity.
+    '''
+    return _core_all(is_call, S, t, sigma, _core(is_call, S, K, r, t, sigma))
+
+
+def _core_all(is_call, S, t, sigma, core_values):
+    '''
+    Calculates the values of core_all from the values of _core, for callers that also need the values of _core.
+    '''
+    d1, d2, sqrt_t, inv_sig_sqrt_t, K_disc, rK_disc, N_d1, N_d2, N_neg_d1, N_neg_d2, pdf_d1 = core_values
+
+    gamma_value = pdf_d1 * inv_sig_sqrt_t / S
+    vega_value = S * sqrt_t * pdf_d1 / 100 # We are interested in 1% increase in volatility, thus we divide by 100
+    theta_decay = - S * pdf_d1 * sigma/(2 * sqrt_t)
+
+    # The option type is checked once here, all of the type specific formulas are grouped under it
+    # Put-call parity: P = C - S + K*exp(-r*t). The price it gives can come out slightly negative when it is
+    # much smaller than S and K, since it is the difference of two large numbers, so it is clamped at 0
+    if is_call:
+        call_price = N_d1*S - N_d2*K_disc
+        put_price = max(0.0, call_price - S + K_disc)
+        delta_value = N_d1 # N(d1) is equal to options delta
+        theta_value = (theta_decay - rK_disc * N_d2)/365
+        rho_value = t * K_disc * N_d2 / 100 # We are interested in 1% increase in rates, thus we divide by 100
+    else:
+        put_price = K_disc*N_neg_d2 - S*N_neg_d1
+        call_price = max(0.0, put_price + S - K_disc)
+        delta_value = -N_neg_d1
+        theta_value = (theta_decay + rK_disc * N_neg_d2)/365
+        rho_value = -t * K_disc * N_neg_d2 / 100 # We are interested in 1% increase in rates, thus we divide by 100
+
+    return call_price, put_price, delta_value, gamma_value, theta_value, vega_value, rho_value
+
+
+def core(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the option price, delta, gamma, theta, vega and rho from a single evaluation of _core.
+    '''
+    call_price, put_price, delta_value, gamma_value, theta_value, vega_value, rho_value = core_all(is_call, S, K, r, t, sigma)
+    option_price = call_price if is_call else put_price
+    return option_price, delta_value, gamma_value, theta_value, vega_value, rho_value
+
+
+@lru_cache(maxsize=1024)
+def core_cached(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the same values as core, but remembers the results for the last 1024 distinct inputs,
+    so asking again for an option that was already priced skips the calculation.
+    '''
+    return core(is_call, S, K, r, t, sigma)
+
+
+def core_nb(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the call price, put price, delta, gamma, theta, vega and rho in a single kernel compiled with Numba.
+    Without Numba the values are calculated by core_all instead, which is faster than running the kernel as plain Python.
+    '''
+    # Imported here so that Numba is only loaded once the kernel is needed
+    from bs_core_numba import NUMBA_AVAILABLE, _all_greeks
+    if NUMBA_AVAILABLE:
+        return _all_greeks(is_call, S, K, r, t, sigma)
+
+    return core_all(is_call, S, K, r, t, sigma)
+
+
+def bs_batch_nb(is_call, S, K, r, t, sigma):
+    '''
+    Calculates Black–Scholes prices for a batch of European options at once.
+    S, K and sigma are NumPy arrays of equal length, r and t are shared by every contract.
+    is_call is True (or 'c'/'call') to price calls and False (or 'p'/'put') to price puts.
+    '''
+    import numpy as np
+    is_call = parse_option_type(is_call)
+    S, K, sigma = (np.asarray(x, dtype=float) for x in (S, K, sigma))
+    # The compiled kernel doesn't check bounds, so arrays of different lengths would be read past their end
+    if S.ndim != 1 or S.shape != K.shape or S.shape != sigma.shape:
+        raise ValueError("S, K and sigma must be one-dimensional arrays of equal length")
+    # The Numba kernel is only imported when a batch is priced, so loading Numba doesn't delay programs that never use it
+    from bs_core_numba import bs_batch_kernel
+    return bs_batch_kernel(bool(is_call), S, K, float(r), float(t), sigma)
+
+
+def bs_batch_np(is_call, S, K, r, t, sigma):
+    '''
+    Calculates Black–Scholes prices for a grid of European options with NumPy only, without needing Numba.
+    All inputs can be scalars or NumPy arrays and are broadcast against each other, e.g. to price a strike × volatility surface.
+    is_call is True (or 'c'/'call') for calls and False (or 'p'/'put') for puts, or a boolean array to mix them.
+    '''
+    import numpy as np
+    return _bs_batch_array(np, ndtr, is_call, S, K, r, t, sigma)
+
+
+# Below this many contracts, copying the inputs to the GPU and the prices back costs more than the GPU saves
+GPU_MIN_BATCH_SIZE = 1_000_000
+
+
+def bs_batch_gpu(is_call, S, K, r, t, sigma, xp=None):
+    '''
+    Calculates Black–Scholes prices for a grid of European options on the GPU, with the same inputs as bs_batch_np.
+    When xp is given it is the array module to compute with, cupy or jax.numpy, and the prices are returned as an array
+    of that module. JAX must have 64-bit floats enabled (jax_enable_x64), since single precision isn't accurate enough.
+    When xp is None, CuPy is used if it is installed, a CUDA device is available and the batch has at least
+    GPU_MIN_BATCH_SIZE contracts, otherwise the batch is priced on the CPU by bs_batch_np; the prices are always
+    returned as a NumPy array.
+    '''
+    if xp is None:
+        import numpy as np
+        size = math.prod(np.broadcast_shapes(*(np.shape(x) for x in (is_call, S, K, r, t, sigma))))
+        if size < GPU_MIN_BATCH_SIZE:
+            return bs_batch_np(is_call, S, K, r, t, sigma)
+        try:
+            import cupy
+            from cupy.cuda.driver import CUDADriverError
+            from cupy.cuda.runtime import CUDARuntimeError
+        except ImportError:
+            return bs_batch_np(is_call, S, K, r, t, sigma)
+        try:
+            return cupy.asnumpy(bs_batch_gpu(is_call, S, K, r, t, sigma, xp=cupy))
+        except (CUDARuntimeError, CUDADriverError):
+            # CuPy is installed, but there is no usable CUDA device
+            return bs_batch_np(is_call, S, K, r, t, sigma)
+
+    # The GPU libraries are only imported when they are used, since loading them is slow
+    if xp.__name__ == "cupy":
+        from cupyx.scipy.special import ndtr as xp_ndtr
+    elif xp.__name__ == "jax.numpy":
+        import jax
+        from jax.scipy.special import ndtr as xp_ndtr
+        # Without it JAX silently computes in float32, which loses most of the precision of the prices
+        if not jax.config.jax_enable_x64:
+            raise ValueError("JAX must have 64-bit floats enabled, e.g. jax.config.update('jax_enable_x64', True)")
+    else:
+        raise ValueError("xp must be cupy or jax.numpy")
+    return _bs_batch_array(xp, xp_ndtr, is_call, S, K, r, t, sigma)
+
+
+def _bs_batch_array(xp, xp_ndtr, is_call, S, K, r, t, sigma):
+    '''
+    Calculates Black–Scholes prices for broadcast arrays using the array module xp and its ndtr function.
+    '''
+    is_call = parse_option_type(is_call)
+    S, K, r, t, sigma = (xp.asarray(x, dtype=float) for x in (S, K, r, t, sigma))
+    sig_sqrt_t = sigma*xp.sqrt(t)
+    d1 = (xp.log(S/K) + (r + 0.5*sigma*sigma)*t)/sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    K_disc = K*xp.exp(-r*t)
+    # C = S*N(d1) - K*exp(-r*t)*N(d2) and P = -(S*N(-d1) - K*exp(-r*t)*N(-d2)), so both are one formula with sign +1 or -1.
+    # Puts are not derived from calls by put-call parity, which rounds the prices of out-of-the-money puts to 0 or below
+    sign = xp.where(xp.asarray(is_call), 1.0, -1.0)
+    return sign*(xp_ndtr(sign*d1)*S - xp_ndtr(sign*d2)*K_disc)
+
+
+def get_input():
+    '''
+    Gets the user input.
+    '''
+    while True:
+        try:
+            # Get option type, stock price, strike price, risk-free interest rate, time to maturity, and volatility
+            # Convert the option type to a boolean once, so the calculations don't compare strings
+            is_call = parse_option_type(input("Option type - type 'c' or 'call' for call option, 'p' or 'put' for put option: "))
+
+            S = float(input("Current stock price: ").replace(",", "."))
+
+            K = float(input("Strike price: ").replace(",", "."))
+
+            r = parse_decimal(input("Risk-free interest rate: "))
+
+            t = parse_maturity(input("Time to maturity (in years): "))
+
+            sigma = parse_decimal(input("Volatility of returns of an underlying asset: "))
+
+            return is_call, S, K, r, t, sigma
+        except ValueError as e:
+            print(str(e))
+
+
+def run_cli(interactive_main, description):
+    '''
+    Runs a command line front end. Without a CSV file it calls interactive_main to prompt the user when attached to a terminal,
+    and otherwise prices the contracts from standard input or the CSV file with cli_batch.
+    '''
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--csv", help="CSV file with one contract per row: type,S,K,r,t,sigma")
+    parser.add_argument("--out", help="CSV file to write the results to (default: standard output)")
+    args = parser.parse_args()
+
+    # Without a CSV file, prompt the user when attached to a terminal and read contracts from piped input otherwise
+    if args.csv is None and sys.stdin.isatty():
+        interactive_main()
+        return
+
+    try:
+        stream = open(args.csv, newline="") if args.csv else sys.stdin
+    except OSError as e:
+        parser.error(f"can't open '{args.csv}': {e.strerror}")
+    try:
+        out = open(args.out, "w", newline="") if args.out else sys.stdout
+    except OSError as e:
+        parser.error(f"can't open '{args.out}': {e.strerror}")
+    try:
+        cli_batch(stream, out)
+    finally:
+        if args.csv:
+            stream.close()
+        if args.out:
+            out.close()
+
+
+def cli_batch(stream, out=None):
+    '''
+    Prices every contract read from stream, one contract per line in the form type,S,K,r,t,sigma,
+    and writes the option price and greeks for each of them to out as CSV (default: standard output).
+    Inputs are interpreted the same way as in get_input. Empty lines, lines starting with '#'
+    and a header row starting with 'type' are skipped; invalid lines and lines that can't be priced,
+    e.g. because a value overflows, are reported on standard error.
+    '''
+    writer = csv.writer(out if out is not None else sys.stdout)
+    writer.writerow(["type", "S", "K", "r", "t", "sigma", "price", "delta", "gamma", "theta", "vega", "rho"])
+    for line_number, row in enumerate(csv.reader(stream), start=1):
+        if not row or row[0].strip().startswith("#") or row[0].strip().lower() == "type":
+            continue
+        try:
+            if len(row) != 6:
+                raise ValueError("Expected 6 values: type,S,K,r,t,sigma")
+            is_call = parse_option_type(row[0])
+            S = float(row[1].replace(",", "."))
+            K = float(row[2].replace(",", "."))
+            r = parse_decimal(row[3])
+            t = parse_maturity(row[4])
+            sigma = parse_decimal(row[5])
+            # Written so that NaN fails the checks as well
+            if not all(0 < x < math.inf for x in (S, K, t, sigma)):
+                raise ValueError("S, K, t and sigma must be finite numbers greater than 0")
+            if not math.isfinite(r):
+                raise ValueError("r must be a finite number")
+        except ValueError as e:
+            print(f"Line {line_number}: {e}", file=sys.stderr)
+            continue
+        try:
+            values = core(is_call, S, K, r, t, sigma)
+        except (ValueError, ArithmeticError) as e:
+            print(f"Line {line_number}: The contract can't be priced: {e}", file=sys.stderr)
+            continue
+        writer.writerow(["call" if is_call else "put", S, K, r, t, sigma, *values])
+
+
+def parse_option_type(option_type):
+    '''
+    Converts an option type given as 'c' or 'call' for a call option, and 'p' or 'put' for a put option, to is_call.
+    Any other value, e.g. a boolean or an array of booleans, is already is_call and is returned unchanged.
+    '''
+    if not isinstance(option_type, str):
+        return option_type
+    option_type = option_type.strip().lower()
+    if option_type not in ["c", "call", "p", "put"]:
+        raise ValueError("Option type must be 'c' or 'call' for call option, and 'p' or 'put' for put option")
+    return option_type in ("c", "call")
+
+
+def parse_decimal(value):
+    '''
+    Converts a number given as a decimal or as a percentage (e.g. "5%") to a float.
+    '''
+    value = value.replace(",", ".")
+    # If input is in percentage, remove the percentage sign and convert to float
+    if "%" in value:
+        return float(value.replace("%", "")) / 100
+    return float(value)
+
+
+def parse_maturity(value):
+    '''
+    Converts a time to maturity given in years or in days to a float in years.
+    '''
+    t = float(value.replace(",", "."))
+    # If time to maturity is inputted as days to maturity, convert it to time to maturity in years
+    if t > 1:
+        t = t / 365
+    return t
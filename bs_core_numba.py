@@ -0,0 +1,120 @@
+
+
+import math
+import numpy as np
+from bs_core import _INV_SQRT_2PI
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional, without it the batched pricer runs as plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+# Coefficients of the rational approximations of erf and erfc from the Cephes ndtr routine, used by _ndtr
+_T = (9.60497373987051638749E0, 9.00260197203842689217E1, 2.23200534594684319226E3,
+      7.00332514112805075473E3, 5.55923013010394962768E4)
+_U = (3.35617141647503099647E1, 5.21357949780152679795E2, 4.59432382970980127987E3,
+      2.26290000613890934246E4, 4.92673942608635921086E4)
+_P = (2.46196981473530512524E-10, 5.64189564831068821977E-1, 7.46321056442269912687E0,
+      4.86371970985681366614E1, 1.96520832956077098242E2, 5.26445194995477358631E2,
+      9.34528527171957607540E2, 1.02755188689515710272E3, 5.57535335369399327526E2)
+_Q = (1.32281951154744992508E1, 8.67072140885989742329E1, 3.54937778887819891062E2,
+      9.75708501743205489753E2, 1.82390916687909736289E3, 2.24633760818710981792E3,
+      1.65666309194161350182E3, 5.57535340817727675546E2)
+
+
+@njit(inline="always", cache=True, fastmath=True)
+def _ndtr(a):
+    '''
+    Standard normal cumulative distribution function, ported from the Cephes ndtr routine.
+    The rational approximations are evaluated inline, so the compiler can vectorize them,
+    and math.erfc is only called in the far tails, |a| > 8 * sqrt(2).
+    '''
+    x = a * 0.7071067811865476
+    z = abs(x)
+    if z < 1.0:
+        # N(a) = (1 + erf(x)) / 2
+        zz = x * x
+        erf = x * ((((_T[0]*zz + _T[1])*zz + _T[2])*zz + _T[3])*zz + _T[4]) \
+            / (((((zz + _U[0])*zz + _U[1])*zz + _U[2])*zz + _U[3])*zz + _U[4])
+        return 0.5 + 0.5 * erf
+    if z < 8.0:
+        # erfc(z) / 2
+        y = 0.5 * math.exp(-z * z) \
+            * ((((((((_P[0]*z + _P[1])*z + _P[2])*z + _P[3])*z + _P[4])*z + _P[5])*z + _P[6])*z + _P[7])*z + _P[8]) \
+            / ((((((((z + _Q[0])*z + _Q[1])*z + _Q[2])*z + _Q[3])*z + _Q[4])*z + _Q[5])*z + _Q[6])*z + _Q[7])
+    else:
+        y = 0.5 * math.erfc(z)
+    return 1.0 - y if x > 0.0 else y
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def bs_batch_kernel(is_call, S, K, r, t, sigma):
+    '''
+    Calculates Black–Scholes prices for a batch of European options at once, see bs_core.bs_batch_nb.
+    '''
+    n = S.shape[0]
+    prices = np.empty(n)
+    sqrt_t = math.sqrt(t)
+    disc = math.exp(-r*t)
+    # (r + sigma^2/2)*t is split as r*t + (t/2)*sigma^2, so each contract only needs multiply-adds for it
+    r_t = r*t
+    half_t = 0.5*t
+    for i in prange(n):
+        sig_sqrt_t = sigma[i]*sqrt_t
+        d1 = (math.log1p((S[i] - K[i])/K[i]) + r_t + half_t*sigma[i]*sigma[i])/sig_sqrt_t
+        d2 = d1 - sig_sqrt_t
+        K_disc = K[i]*disc
+        if is_call:
+            prices[i] = _ndtr(d1)*S[i] - _ndtr(d2)*K_disc
+        else:
+            # Calculated directly rather than by put-call parity, which rounds out-of-the-money put prices to 0 or below
+            prices[i] = _ndtr(-d2)*K_disc - _ndtr(-d1)*S[i]
+    return prices
+
+
+@njit(cache=True, fastmath=True)
+def _all_greeks(is_call, S, K, r, t, sigma):
+    '''
+    Calculates the call and put prices and the delta, gamma, theta, vega and rho of a single option in one compiled pass.
+    Returns them in the order of BlackScholesModel.calculate_option_metrics.
+    '''
+    sqrt_t = math.sqrt(t)
+    sig_sqrt_t = sigma*sqrt_t
+    # One reciprocal replaces the divisions by sigma*sqrt(t) in d1 and gamma
+    inv_sig_sqrt_t = 1.0/sig_sqrt_t
+    d1 = (math.log1p((S - K)/K) + (r + 0.5*sigma*sigma)*t)*inv_sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    K_disc = K*math.exp(-r*t)
+    pdf_d1 = _INV_SQRT_2PI*math.exp(-0.5*d1*d1)
+
+    gamma = pdf_d1*inv_sig_sqrt_t/S
+    vega = S*sqrt_t*pdf_d1/100
+    theta_decay = -S*pdf_d1*sigma/(2*sqrt_t)
+    # Put-call parity: P = C - S + K*exp(-r*t), clamped at 0 since it can round a small price slightly below 0.
+    # The price of the given option type is calculated directly, so that a small put price isn't lost to rounding
+    if is_call:
+        N_d1 = _ndtr(d1)
+        N_d2 = _ndtr(d2)
+        call_price = N_d1*S - N_d2*K_disc
+        put_price = max(0.0, call_price - S + K_disc)
+        delta = N_d1
+        theta = (theta_decay - r*K_disc*N_d2)/365
+        rho = t*K_disc*N_d2/100
+    else:
+        N_neg_d1 = _ndtr(-d1)
+        N_neg_d2 = _ndtr(-d2)
+        put_price = N_neg_d2*K_disc - N_neg_d1*S
+        call_price = max(0.0, put_price + S - K_disc)
+        delta = -N_neg_d1
+        theta = (theta_decay + r*K_disc*N_neg_d2)/365
+        rho = -t*K_disc*N_neg_d2/100
+    return call_price, put_price, delta, gamma, theta, vega, rho
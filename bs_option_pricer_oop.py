@@ -1,161 +1,128 @@
 
 
-import math
-from scipy.stats import norm
+from bs_core import _core, _core_all, core_nb, get_input, parse_option_type, run_cli
+
 
 class BlackScholesModel:
-    def __init__(self, option_type, S, K, r, t, sigma):
+    def __init__(self, option_type, S, K, r, t, sigma, use_numba=False):
         '''
         Initialize the BlackScholesModel object with the given parameters.
+        option_type is 'c' or 'call' (or True) for a call option, and 'p' or 'put' (or False) for a put option.
+        With use_numba the prices and greeks are calculated by a kernel compiled with Numba, which pays off for programs
+        that value many options; loading and compiling it makes a program that values a single option slower.
         '''
-        self.option_type = option_type
+        self.is_call = parse_option_type(option_type)
         self.S = S
         self.K = K
         self.r = r
         self.t = t
         self.sigma = sigma
+        self.use_numba = use_numba
+        self._core_inputs = None
+        self._metrics_inputs = None
+
+    def _calculate_core(self):
+        '''
+        Calculate the values shared by the formulas with bs_core, on first use and again only after one of the inputs has changed.
+        '''
+        inputs = (self.is_call, self.S, self.K, self.r, self.t, self.sigma)
+        if inputs != self._core_inputs:
+            self._core_values = _core(*inputs)
+            self._core_inputs = inputs
+        return self._core_values
+
+    def _calculate_all(self):
+        '''
+        Calculate the call price, put price, delta, gamma, theta, vega and rho, on first use and again only after one of the inputs has changed.
+        '''
+        inputs = (self.is_call, self.S, self.K, self.r, self.t, self.sigma)
+        if inputs != self._metrics_inputs:
+            if self.use_numba:
+                self._metrics = core_nb(*inputs)
+            else:
+                self._metrics = _core_all(self.is_call, self.S, self.t, self.sigma, self._calculate_core())
+            self._metrics_inputs = inputs
+        return self._metrics
 
     def calculate_d1_d2(self):
         '''
-        Calculate d1 and d2 for later use in option pricing formulas.
+        Calculate d1 and d2 used in the option pricing formulas.
         '''
-        d1 = (math.log(self.S / self.K) + (self.r + (self.sigma**2) / 2) * self.t) / (self.sigma * math.sqrt(self.t))
-        d2 = d1 - self.sigma * math.sqrt(self.t)
+        d1, d2 = self._calculate_core()[:2]
         return d1, d2
 
-    def calculate_N_values(self, d1, d2):
+    def calculate_N_values(self):
         '''
-        Calculate various N values for option pricing.
+        Calculate various N values for option pricing, N(d1), N'(d1), N(d2), N(-d1) and N(-d2).
         '''
-        N_d1 = norm.cdf(d1)
-        N_d1_gamma_theta_vega = norm.pdf(d1)
-        N_d2 = norm.cdf(d2)
-        N_neg_d1 = norm.cdf(-d1)
-        N_neg_d2 = norm.cdf(-d2)
-        return N_d1, N_d1_gamma_theta_vega, N_d2, N_neg_d1, N_neg_d2
+        d1, d2, sqrt_t, inv_sig_sqrt_t, K_disc, rK_disc, N_d1, N_d2, N_neg_d1, N_neg_d2, pdf_d1 = self._calculate_core()
+        return N_d1, pdf_d1, N_d2, N_neg_d1, N_neg_d2
 
-    def calculate_call_price(self, N_d1, N_d2):
+    def calculate_call_price(self):
         '''
         Calculate call option price.
         '''
-        return N_d1 * self.S - N_d2 * self.K * math.exp(-self.r * self.t)
+        return self._calculate_all()[0]
 
-    def calculate_put_price(self, N_neg_d1, N_neg_d2):
+    def calculate_put_price(self):
         '''
         Calculate put option price.
         '''
-        return self.K * math.exp(-self.r * self.t) * N_neg_d2 - (self.S * N_neg_d1)
+        return self._calculate_all()[1]
 
-    def calculate_delta(self, N_d1, N_neg_d1):
+    def calculate_delta(self):
         '''
         Calculate the delta value, a measure of option sensitivity to changes in the underlying asset price.
         '''
-        if self.option_type in ["c", "call"]:
-            return N_d1
-        elif self.option_type in ["p", "put"]:
-            return -N_neg_d1
+        return self._calculate_all()[2]
 
-    def calculate_gamma(self, N_d1_gamma_theta_vega):
+    def calculate_gamma(self):
         '''
         Calculate the gamma value, a measure of option sensitivity to changes in the underlying asset price.
         '''
-        return N_d1_gamma_theta_vega / (self.S * self.sigma * math.sqrt(self.t))
+        return self._calculate_all()[3]
 
-    def calculate_theta(self, N_d1_gamma_theta_vega, N_d2, N_neg_d2):
+    def calculate_theta(self):
         '''
         Calculate the theta value, a measure of option sensitivity to time decay.
         '''
-        if self.option_type in ["c", "call"]:
-            theta = -self.S * N_d1_gamma_theta_vega * self.sigma / (2 * math.sqrt(self.t)) - self.r * self.K * math.exp(-self.r * self.t) * N_d2
-        elif self.option_type in ["p", "put"]:
-            theta = -self.S * N_d1_gamma_theta_vega * self.sigma / (2 * math.sqrt(self.t)) + self.r * self.K * math.exp(-self.r * self.t) * N_neg_d2
-        return theta / 365
+        return self._calculate_all()[4]
 
-    def calculate_vega(self, N_d1_gamma_theta_vega):
+    def calculate_vega(self):
         '''
         Calculate the vega value, a measure of option sensitivity to changes in volatility.
         '''
-        return (self.S * math.sqrt(self.t) * N_d1_gamma_theta_vega) / 100   # We are interested in 1% increase in volatility, thus we divide by 100
+        return self._calculate_all()[5]
 
-    def calculate_rho(self, N_d2, N_neg_d2):
+    def calculate_rho(self):
         '''
         Calculate the rho value, a measure of option sensitivity to changes in interest rates.
         '''
-        if self.option_type in ["c", "call"]:
-            return (self.K * self.t * math.exp(-self.r * self.t) * N_d2) / 100  # We are interested in 1% increase in rates, thus we divide by 100
-        elif self.option_type in ["p", "put"]:
-            return (-self.K * self.t * math.exp(-self.r * self.t) * N_neg_d2) / 100 # We are interested in 1% increase in rates, thus we divide by 100
+        return self._calculate_all()[6]
 
     def calculate_option_metrics(self):
         '''
         Calculate various option metrics using the Black-Scholes formulas.
+        Returns the call price, put price, delta, gamma, theta, vega and rho.
         '''
-        d1, d2 = self.calculate_d1_d2()
-        N_d1, N_d1_gamma_theta_vega, N_d2, N_neg_d1, N_neg_d2 = self.calculate_N_values(d1, d2)
-
-        # Call and put prices
-        call_price = self.calculate_call_price(N_d1, N_d2)
-        put_price = self.calculate_put_price(N_neg_d1, N_neg_d2)
-
-        # Option "greeks"
-        delta_value = self.calculate_delta(N_d1, N_neg_d1)
-        gamma_value = self.calculate_gamma(N_d1_gamma_theta_vega)
-        theta_value = self.calculate_theta(N_d1_gamma_theta_vega, N_d2, N_neg_d2)
-        vega_value = self.calculate_vega(N_d1_gamma_theta_vega)
-        rho_value = self.calculate_rho(N_d2, N_neg_d2)
-
-        return call_price, put_price, delta_value, gamma_value, theta_value, vega_value, rho_value
-
-def get_input():
-    '''
-    Gets the input from a user.
-    '''
-    while True:
-        try:
-            # Get option type, stock price, strike price, risk-free interest rate, time to maturity, and volatility
-            option_type = input("Option type - type 'c' or 'call' for call option, 'p' or 'put' for put option: ").lower()
-            if option_type not in ["c", "call", "p", "put"]:
-                raise ValueError("Please input 'c' or 'call' for call option, and 'p' or 'put' for put option")
-
-            S = float(input("Current stock price: ").replace(",", "."))
-
-            K = float(input("Strike price: ").replace(",", "."))
-
-            r = str(input("Risk-free interest rate: ").replace(",", "."))
-            # If input is in percentage, remove the percentage sign and convert to float
-            if "%" in str(r):
-                r = r.replace("%", "")
-                r = float(r) / 100
-            r = float(r)
-
-            t = float(input("Time to maturity (in years): ").replace(",", "."))
-            # If time to maturity is inputted as days to maturity, convert it to time to maturity in years
-            if t > 1:
-                t = t / 365
-
-            sigma = input("Volatility of returns of an underlying asset: ").replace(",", ".")
-            # If input is in percentage, remove the percentage sign and convert to float
-            if "%" in str(sigma):
-                sigma = sigma.replace("%", "")
-                sigma = float(sigma) / 100
-            sigma = float(sigma)
-
-            return option_type, S, K, r, t, sigma
-        except ValueError as e:
-            print(str(e))
+        return self._calculate_all()
 
 def main():
+    run_cli(interactive_main, "Black–Scholes option price and greeks calculator, OOP version.")
+
+
+def interactive_main():
     # Get user input
-    option_type, S, K, r, t, sigma = get_input()
+    is_call, S, K, r, t, sigma = get_input()
 
     # Calculate option-related values
-    option_model = BlackScholesModel(option_type, S, K, r, t, sigma)
+    option_model = BlackScholesModel(is_call, S, K, r, t, sigma)
     call_price, put_price, delta_value, gamma_value, theta_value, vega_value, rho_value = option_model.calculate_option_metrics()
 
     # Display results
-    if option_type in ["c", "call"]:
+    if is_call:
         print(f"Call Option Price is {call_price}.")
-    elif option_type in ["p", "put"]:
+    else:
         print(f"Put Option Price is {put_price}.")
 
     print(f"Delta is {delta_value}.")
@@ -0,0 +1,185 @@
+import io
+import math
+
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+import bs_core
+import bs_option_pricer
+from bs_core import bs_batch_nb, bs_batch_np, cli_batch, core, core_all, core_cached, core_nb, parse_option_type
+from bs_option_pricer_oop import BlackScholesModel
+
+
+# S, K, r, t, sigma
+CONTRACTS = [
+    (100.0, 100.0, 0.05, 0.5, 0.2),     # at the money
+    (120.0, 100.0, 0.05, 0.5, 0.2),     # call in, put out of the money
+    (80.0, 100.0, 0.05, 0.5, 0.2),      # call out, put in the money
+    (60.0, 100.0, 0.05, 0.5, 0.2),      # far out of the money call
+    (100.0, 100.0, 0.0, 2.0, 0.6),      # zero rate, long maturity, high volatility
+    (300.0, 100.0, 0.01, 0.1, 0.1),     # deep tail, the put is worth about 5e-266
+    (100.0, 300.0, 0.01, 0.1, 0.1),     # deep tail, the call is worth about 0
+]
+
+
+def _baseline(is_call, S, K, r, t, sigma):
+    '''
+    The price and greeks from the original scipy.stats.norm formulas, in the order of core.
+    '''
+    d1 = (math.log(S / K) + (r + (sigma**2) / 2) * t) / (sigma * math.sqrt(t))
+    d2 = d1 - sigma * math.sqrt(t)
+    K_disc = K * math.exp(-r * t)
+    gamma = norm.pdf(d1) / (S * sigma * math.sqrt(t))
+    vega = S * math.sqrt(t) * norm.pdf(d1) / 100
+    theta_decay = -S * norm.pdf(d1) * sigma / (2 * math.sqrt(t))
+    if is_call:
+        price = norm.cdf(d1) * S - norm.cdf(d2) * K_disc
+        delta = norm.cdf(d1)
+        theta = (theta_decay - r * K_disc * norm.cdf(d2)) / 365
+        rho = t * K_disc * norm.cdf(d2) / 100
+    else:
+        price = K_disc * norm.cdf(-d2) - S * norm.cdf(-d1)
+        delta = -norm.cdf(-d1)
+        theta = (theta_decay + r * K_disc * norm.cdf(-d2)) / 365
+        rho = -t * K_disc * norm.cdf(-d2) / 100
+    return price, delta, gamma, theta, vega, rho
+
+
+def _assert_close(got, expected, rel_tol=1e-9):
+    for a, b in zip(got, expected):
+        assert math.isclose(a, b, rel_tol=rel_tol, abs_tol=1e-300), (got, expected)
+
+
+@pytest.mark.parametrize("contract", CONTRACTS)
+@pytest.mark.parametrize("is_call", [True, False])
+def test_core_matches_baseline(is_call, contract):
+    expected = _baseline(is_call, *contract)
+    _assert_close(core(is_call, *contract), expected)
+    _assert_close(core_cached(is_call, *contract), expected)
+    assert core(is_call, *contract)[0] >= 0
+
+
+@pytest.mark.parametrize("contract", CONTRACTS)
+@pytest.mark.parametrize("is_call", [True, False])
+def test_core_all_returns_both_prices(is_call, contract):
+    S, K, r, t, sigma = contract
+    call_price, put_price, *greeks = core_all(is_call, *contract)
+    _assert_close(greeks, _baseline(is_call, *contract)[1:])
+    # The price of the other option type comes from put-call parity, which is only accurate relative to S and K
+    for price, expected in ((call_price, _baseline(True, *contract)[0]), (put_price, _baseline(False, *contract)[0])):
+        assert price >= 0
+        assert math.isclose(price, expected, rel_tol=1e-9, abs_tol=1e-13 * max(S, K))
+
+
+@pytest.mark.parametrize("contract", CONTRACTS)
+@pytest.mark.parametrize("is_call", [True, False])
+def test_core_nb_matches_core_all(is_call, contract):
+    _assert_close(core_nb(is_call, *contract), core_all(is_call, *contract))
+
+
+@pytest.mark.parametrize("contract", CONTRACTS)
+@pytest.mark.parametrize("option_type", ["c", "call", "p", "PUT"])
+def test_functional_front_end(option_type, contract):
+    is_call = option_type.lower() in ("c", "call")
+    price, delta, gamma, theta, vega, rho = _baseline(is_call, *contract)
+    _assert_close([bs_option_pricer.bsmodel(option_type, *contract)], [price])
+    _assert_close([bs_option_pricer.delta(option_type, *contract)], [delta])
+    _assert_close([bs_option_pricer.gamma(*contract)], [gamma])
+    _assert_close([bs_option_pricer.theta(option_type, *contract)], [theta])
+    _assert_close([bs_option_pricer.vega(*contract)], [vega])
+    _assert_close([bs_option_pricer.rho(option_type, *contract)], [rho])
+
+
+@pytest.mark.parametrize("contract", CONTRACTS)
+@pytest.mark.parametrize("option_type", ["call", "put"])
+@pytest.mark.parametrize("use_numba", [False, True])
+def test_oop_facade(use_numba, option_type, contract):
+    is_call = option_type == "call"
+    model = BlackScholesModel(option_type, *contract, use_numba=use_numba)
+    price, delta, gamma, theta, vega, rho = _baseline(is_call, *contract)
+    option_price = model.calculate_call_price() if is_call else model.calculate_put_price()
+    methods = [option_price, model.calculate_delta(), model.calculate_gamma(), model.calculate_theta(),
+               model.calculate_vega(), model.calculate_rho()]
+    _assert_close(methods, [price, delta, gamma, theta, vega, rho])
+    assert model.calculate_option_metrics() == (model.calculate_call_price(), model.calculate_put_price(), *methods[1:])
+
+
+def test_oop_facade_recalculates_after_an_input_changes():
+    model = BlackScholesModel("p", 100.0, 100.0, 0.05, 0.5, 0.2)
+    model.calculate_option_metrics()
+    model.S = 80.0
+    _assert_close([model.calculate_put_price()], [_baseline(False, 80.0, 100.0, 0.05, 0.5, 0.2)[0]])
+    d1, d2 = model.calculate_d1_d2()
+    N_d1, pdf_d1, N_d2, N_neg_d1, N_neg_d2 = model.calculate_N_values()
+    _assert_close([N_neg_d1, N_neg_d2, pdf_d1], [norm.cdf(-d1), norm.cdf(-d2), norm.pdf(d1)])
+
+
+@pytest.mark.parametrize("is_call", [True, False])
+def test_batch_pricers_match_baseline(is_call):
+    S, K, r, t, sigma = (np.array(x) for x in zip(*CONTRACTS))
+    for contract_r, contract_t in zip(r, t):
+        # r and t are shared by every contract of a batch
+        expected = [_baseline(is_call, S[i], K[i], contract_r, contract_t, sigma[i])[0] for i in range(len(S))]
+        for prices in (bs_batch_np(is_call, S, K, contract_r, contract_t, sigma),
+                       bs_batch_nb(is_call, S, K, contract_r, contract_t, sigma)):
+            assert np.all(prices >= 0)
+            _assert_close(prices, expected)
+
+
+def test_batch_np_mixes_calls_and_puts():
+    prices = bs_batch_np(np.array([True, False]), 80.0, 100.0, 0.05, 0.5, 0.2)
+    _assert_close(prices, [_baseline(True, 80.0, 100.0, 0.05, 0.5, 0.2)[0], _baseline(False, 80.0, 100.0, 0.05, 0.5, 0.2)[0]])
+
+
+def test_no_negative_put_prices():
+    S = np.linspace(100.0, 400.0, 3001)
+    assert np.all(bs_batch_np(False, S, 100.0, 0.05, 0.25, 0.2) >= 0)
+    assert np.all(bs_batch_nb(False, S, np.full_like(S, 100.0), 0.05, 0.25, np.full_like(S, 0.2)) >= 0)
+    assert all(core(False, x, 100.0, 0.05, 0.25, 0.2)[0] >= 0 for x in S)
+
+
+def test_batch_nb_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        bs_batch_nb(True, [100.0, 110.0], [100.0], 0.05, 0.5, [0.2, 0.2])
+    with pytest.raises(ValueError):
+        bs_batch_nb(True, [[100.0]], [[100.0]], 0.05, 0.5, [[0.2]])
+
+
+def test_parse_option_type():
+    assert parse_option_type("c") is True
+    assert parse_option_type(" Call ") is True
+    assert parse_option_type("p") is False
+    assert parse_option_type("PUT") is False
+    assert parse_option_type(False) is False
+    with pytest.raises(ValueError):
+        parse_option_type("x")
+
+
+def test_cli_batch_reports_and_skips_bad_rows(capsys):
+    rows = "\n".join([
+        "type,S,K,r,t,sigma",
+        "# comment",
+        "c,100,100,5%,0.5,0.2",
+        "x,100,100,0.05,0.5,0.2",
+        "p,100,100,0.05",
+        "p,-100,100,0.05,0.5,0.2",
+        "p,100,100,nan,0.5,0.2",
+        "c,100,100,-1500,0.5,0.2",
+        "p,100,100,0.05,182,20%",
+    ])
+    out = io.StringIO()
+    cli_batch(io.StringIO(rows), out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "type,S,K,r,t,sigma,price,delta,gamma,theta,vega,rho"
+    assert len(lines) == 3
+    assert lines[1].startswith("call,100.0,100.0,0.05,0.5,0.2,")
+    assert lines[2].startswith("put,100.0,100.0,0.05,")
+    _assert_close([float(lines[1].split(",")[6])], [_baseline(True, 100.0, 100.0, 0.05, 0.5, 0.2)[0]])
+    errors = capsys.readouterr().err.splitlines()
+    assert [e.split(":")[0] for e in errors] == ["Line 4", "Line 5", "Line 6", "Line 7", "Line 8"]
+
+
+def test_ndtr_is_loaded_on_first_use():
+    assert bs_core.ndtr(0.0) == 0.5
+    assert type(bs_core.ndtr).__name__ == "ufunc"
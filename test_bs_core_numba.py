@@ -0,0 +1,40 @@
+import numpy as np
+from scipy.special import ndtr
+
+from bs_core_numba import _ndtr
+
+
+def _ndtr_errors(lo, hi):
+    '''
+    Evaluates _ndtr on a grid over [lo, hi] and returns the grid, the reference values from scipy.special.ndtr and the absolute errors.
+    '''
+    x = np.linspace(lo, hi, 4001)
+    ref = ndtr(x)
+    got = np.array([_ndtr(a) for a in x])
+    return x, ref, np.abs(got - ref)
+
+
+def test_ndtr_erf_branch():
+    # |x| < 1 with x = a/sqrt(2)
+    x, ref, err = _ndtr_errors(-1.414, 1.414)
+    assert np.max(err / ref) < 1e-14
+
+
+def test_ndtr_erfc_rational_branch():
+    # 1 <= |x| < 8
+    for lo, hi in ((-11.31, -1.415), (1.415, 11.31)):
+        x, ref, err = _ndtr_errors(lo, hi)
+        assert np.max(err / ref) < 1e-14
+
+
+def test_ndtr_erfc_tail():
+    # |x| >= 8, where math.erfc is used. The rounding of x = a/sqrt(2) is amplified by about 2*x*x in erfc,
+    # so the relative error grows towards 1e-13 at the bottom of the normal double range
+    x, ref, err = _ndtr_errors(-40.0, -11.32)
+    normal = ref >= np.finfo(float).tiny
+    assert np.max(err[normal] / ref[normal]) < 2e-13
+    # Below about -37.5 the result is subnormal and only has absolute precision
+    assert np.max(err[~normal]) < 1e-300
+
+    x, ref, err = _ndtr_errors(11.32, 40.0)
+    assert np.max(err) < 1e-16